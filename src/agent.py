@@ -1,6 +1,7 @@
 import json
 import os
 import re
+import shutil
 import time
 import subprocess
 from abc import ABC
@@ -10,7 +11,7 @@ import tiktoken
 
 from commons.project_container import ProjectContainer
 from logger import setup_logger
-from commons.utils import Status
+from commons.utils import Status, json_loads
 from commons.models import GPT, LiteLLM
 
 from litellm import get_llm_provider
@@ -68,12 +69,26 @@ class AIAgent(ABC):
         Returns:
             dict: Dictionary with truncated stdout/stderr and command info.
         """
+        trunc_msg = "[Truncated to fit context window]"
+
+        # Every token covers at least one UTF-8 byte, so byte counts bound the token counts.
+        # Outputs that provably fit are returned untouched without tokenizing them.
+        stdout_bytes = len(result["stdout"].encode("utf-8"))
+        stderr_bytes = len(result["stderr"].encode("utf-8"))
+        if (stderr_bytes <= max_input_tokens // 2 and
+            stdout_bytes + stderr_bytes + len(trunc_msg) <= max_input_tokens):
+            return {
+                "cmd": cmd,
+                "exit_code": result["exit_code"],
+                "stdout": result["stdout"],
+                "stderr": result["stderr"]
+            }
+
         encoding = tiktoken.get_encoding("cl100k_base")
         
         stdout_tokens = encoding.encode(result["stdout"])
         stderr_tokens = encoding.encode(result["stderr"])  
         
-        trunc_msg = "[Truncated to fit context window]"
         trunc_msg_tokens = encoding.encode(trunc_msg)
         
         stderr_limit_threshold = max_input_tokens // 2
@@ -252,14 +267,29 @@ class AIAgent(ABC):
             f.write(json.dumps(log_entry) + "\n")
 
 
+    def _write_file_atomically(self, file_path: str, content: str):
+        # Rename a sibling temp file into place so make never reads a half-written file
+        tmp_path = f"{file_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding="utf-8") as f:
+                f.write(content)
+            if os.path.exists(file_path):
+                # The temp file replaces the original, so carry its permissions over
+                shutil.copymode(file_path, tmp_path)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            # Don't leave a stray .tmp in the harness directory
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
     def update_makefile(self, makefile_content):
-        with open(self.makefile_path, 'w') as file:
-            file.write(makefile_content)
+        self._write_file_atomically(self.makefile_path, makefile_content)
 
     def update_harness(self, harness_code):
-        
-        with open(self.harness_file_path, 'w') as f:
-            f.write(harness_code)
+        self._write_file_atomically(self.harness_file_path, harness_code)
 
     def get_makefile(self):
         with open(self.makefile_path, 'r') as file:
@@ -520,15 +550,22 @@ class AIAgent(ABC):
 
         return abs_file.startswith(abs_harness_dir + os.sep) or abs_file == abs_harness_dir
 
-    def get_overall_coverage(self):
-        """Get overall coverage excluding files in the harness directory."""
+    def _load_coverage_report(self) -> Optional[dict]:
+        """Load viewer-coverage.json, or return None when the build produced no report."""
         coverage_report_path = os.path.join(self.harness_dir, "build/report/json/viewer-coverage.json")
-        if not os.path.exists(coverage_report_path):
+        # Opening directly saves the separate exists() stat on every coverage check
+        try:
+            with open(coverage_report_path, "rb") as f:
+                return json_loads(f.read())
+        except FileNotFoundError:
             logger.error(f"[ERROR] Coverage report not found: {coverage_report_path}")
-            return {}
+            return None
 
-        with open(coverage_report_path, "r") as f:
-            coverage_data = json.load(f)
+    def get_overall_coverage(self):
+        """Get overall coverage excluding files in the harness directory."""
+        coverage_data = self._load_coverage_report()
+        if coverage_data is None:
+            return {}
 
         viewer_coverage = coverage_data.get("viewer-coverage", {})
         function_coverage = viewer_coverage.get("function_coverage", {})
@@ -546,14 +583,10 @@ class AIAgent(ABC):
         return {"hit": total_hit, "total": total_lines, "percentage": percentage}
 
     def _get_function_coverage_status(self, file_path, function_name):
-        coverage_report_path = os.path.join(self.harness_dir, "build/report/json/viewer-coverage.json")
-        if not os.path.exists(coverage_report_path):
-            logger.error(f"[ERROR] Coverage report not found: {coverage_report_path}")
+        coverage_data = self._load_coverage_report()
+        if coverage_data is None:
             return None
 
-        with open(coverage_report_path, "r") as f:
-            coverage_data = json.load(f)
-
         viewer_coverage = coverage_data.get("viewer-coverage", {})
         function_coverage = (
             viewer_coverage.get("coverage", {}).get(file_path, {}).get(function_name, {})
@@ -648,36 +681,44 @@ class AIAgent(ABC):
             )
 
     def save_status(self, tag: str):
-        os.makedirs(self.get_snapshot_dir(), exist_ok=True)
+        snapshot_dir = self.get_snapshot_dir()
+        os.makedirs(snapshot_dir, exist_ok=True)
+        # Snapshots are byte-for-byte copies, so skip decoding and re-encoding the text
         harness_tagged_path = os.path.join(
-            self.get_snapshot_dir(), f"{self.harness_file_name}.{tag}",
+            snapshot_dir, f"{self.harness_file_name}.{tag}",
         )
-        with open(self.harness_file_path, "r", encoding="utf-8") as src:
-            with open(harness_tagged_path, "w", encoding="utf-8") as dst:
-                dst.write(src.read())
+        shutil.copyfile(self.harness_file_path, harness_tagged_path)
         makefile_tagged_path = os.path.join(
-            self.get_snapshot_dir(), f"Makefile.{tag}",
+            snapshot_dir, f"Makefile.{tag}",
         )
-        with open(self.makefile_path, "r", encoding="utf-8") as src:
-            with open(makefile_tagged_path, "w", encoding="utf-8") as dst:
-                dst.write(src.read())
+        shutil.copyfile(self.makefile_path, makefile_tagged_path)
 
     def get_snapshot_dir(self) -> str:
         return getattr(self, "snapshot_dir", os.path.join(self.harness_dir, "snapshots"))
     
+    def _get_backup_contents(self) -> dict[str, tuple[str, str]]:
+        # Created lazily, like snapshot_dir, so agents built without __init__ still work
+        if not hasattr(self, "_backup_contents"):
+            self._backup_contents = {}
+        return self._backup_contents
+
     def create_backup(self, tag: str):
+        with open(self.harness_file_path, "r", encoding="utf-8") as src:
+            harness_content = src.read()
+        with open(self.makefile_path, "r", encoding="utf-8") as src:
+            makefile_content = src.read()
+        # Restores write from memory; the files stay on disk for diffing against the backup
+        self._get_backup_contents()[tag] = (harness_content, makefile_content)
         harness_backup_path = os.path.join(
             self.harness_dir, f"{self.harness_file_name}.{tag}.backup",
         )
-        with open(self.harness_file_path, "r", encoding="utf-8") as src:
-            with open(harness_backup_path, "w", encoding="utf-8") as dst:
-                dst.write(src.read())
+        with open(harness_backup_path, "w", encoding="utf-8") as dst:
+            dst.write(harness_content)
         makefile_backup_path = os.path.join(
             self.harness_dir, f"Makefile.{tag}.backup",
         )
-        with open(self.makefile_path, "r", encoding="utf-8") as src:
-            with open(makefile_backup_path, "w", encoding="utf-8") as dst:
-                dst.write(src.read())
+        with open(makefile_backup_path, "w", encoding="utf-8") as dst:
+            dst.write(makefile_content)
         build_backup_path = os.path.join(
             self.harness_dir, f"build_backup.{tag}",
         )
@@ -694,19 +735,24 @@ class AIAgent(ABC):
             )
         logger.info(f"Backup created sucessfully with tag '{tag}'.")
 
-    def restore_backup(self, tag: str):
-        harness_backup_path = os.path.join(
-            self.harness_dir, f"{self.harness_file_name}.{tag}.backup",
-        )
-        with open(harness_backup_path, "r", encoding="utf-8") as src:
-            with open(self.harness_file_path, "w", encoding="utf-8") as dst:
-                dst.write(src.read())
-        makefile_backup_path = os.path.join(
-            self.harness_dir, f"Makefile.{tag}.backup",
-        )
-        with open(makefile_backup_path, "r", encoding="utf-8") as src:
-            with open(self.makefile_path, "w", encoding="utf-8") as dst:
-                dst.write(src.read())
+    def restore_backup(self, tag: str, discard: bool = False):
+        """Restore the tagged backup; with discard=True the backup is consumed instead of copied"""
+        backup_contents = self._get_backup_contents().get(tag)
+        if backup_contents is None:
+            harness_backup_path = os.path.join(
+                self.harness_dir, f"{self.harness_file_name}.{tag}.backup",
+            )
+            with open(harness_backup_path, "r", encoding="utf-8") as src:
+                harness_content = src.read()
+            makefile_backup_path = os.path.join(
+                self.harness_dir, f"Makefile.{tag}.backup",
+            )
+            with open(makefile_backup_path, "r", encoding="utf-8") as src:
+                makefile_content = src.read()
+        else:
+            harness_content, makefile_content = backup_contents
+        self._write_file_atomically(self.harness_file_path, harness_content)
+        self._write_file_atomically(self.makefile_path, makefile_content)
         build_backup_path = os.path.join(
             self.harness_dir, f"build_backup.{tag}",
         )
@@ -717,13 +763,20 @@ class AIAgent(ABC):
                 check=True,
             )
         if os.path.exists(build_backup_path):
-            subprocess.run(
-                ["cp", "-r", build_backup_path, build_path],
-                check=True,
-            )
+            if discard:
+                # The backup is not needed afterwards, so move it instead of copying the whole tree
+                os.rename(build_backup_path, build_path)
+            else:
+                subprocess.run(
+                    ["cp", "-r", build_backup_path, build_path],
+                    check=True,
+                )
         logger.info(f"Backup restored sucessfully with tag '{tag}'.")
+        if discard:
+            self.discard_backup(tag)
 
     def discard_backup(self, tag: str):
+        self._get_backup_contents().pop(tag, None)
         harness_backup_path = os.path.join(
             self.harness_dir, f"{self.harness_file_name}.{tag}.backup",
         )
@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
+import hashlib
+import logging
 import os
 from pydantic import BaseModel
 import pydantic_core
 import tiktoken
-import json
 import openai
 import random
 import time
@@ -105,7 +106,7 @@ class LiteLLM(LLM):
         # Start with the initial user input
         new_message = {'role': 'user', 'content': input_messages}
 
-        logger.info(f"LLM Prompt:\n{input_messages}")
+        logger.info("LLM Prompt:\n%s", input_messages)
 
         if conversation_history is None:
             conversation_history = []
@@ -130,6 +131,9 @@ class LiteLLM(LLM):
                     lambda: litellm.completion(
                         model=self.name,
                         messages=[{"role": "system", "content": system_messages}] + input_list,
+                        # Marks the static system prompt as a cacheable prefix for providers
+                        # with explicit caching (Anthropic); stripped for OpenAI, which caches automatically
+                        cache_control_injection_points=[{"location": "message", "role": "system"}],
                         response_format=output_format,
                         tool_choice="auto",
                         reasoning="low",
@@ -172,10 +176,14 @@ class LiteLLM(LLM):
                 })
                 print("Tool call id responded: ", item.id)
 
-        print(client_response.choices[0].message.content)
-        parsed_output =output_format.model_validate(json.loads(client_response.choices[0].message.content))
-        parsed_output_dict = parsed_output.model_dump_json(indent=2) if parsed_output else {}
-        logger.info(f"LLM Response:\n{parsed_output_dict}")
+        # The raw JSON duplicates the parsed response logged below, so only dump it when debugging
+        logger.debug("LLM raw response:\n%s", client_response.choices[0].message.content)
+        # pydantic parses and validates the JSON in one native pass, without an intermediate dict
+        parsed_output = output_format.model_validate_json(client_response.choices[0].message.content)
+        # Pretty-printing the whole response (often a full harness) is skipped when INFO is off
+        if logger.isEnabledFor(logging.INFO):
+            parsed_output_dict = parsed_output.model_dump_json(indent=2) if parsed_output else {}
+            logger.info("LLM Response:\n%s", parsed_output_dict)
 
         conversation_history.append({'role': 'assistant', 'content': str(parsed_output)})
 
@@ -206,7 +214,7 @@ class GPT(LLM):
         # Start with the initial user input
         new_message = {'role': 'user', 'content': input_messages}
 
-        logger.info(f"LLM Prompt:\n{input_messages}")
+        logger.info("LLM Prompt:\n%s", input_messages)
 
         if conversation_history is None:
             conversation_history = []
@@ -215,6 +223,10 @@ class GPT(LLM):
 
         input_list = list(conversation_history) 
 
+        # Instructions are sent first and are identical across an agent's calls, so
+        # keying on them routes those calls to the same prefix cache
+        prompt_cache_key = hashlib.sha256(system_messages.encode("utf-8")).hexdigest()[:32]
+
         function_calls_count = 0
         token_usage = {
             "input_tokens": 0,
@@ -232,6 +244,7 @@ class GPT(LLM):
                         model=self.name,
                         instructions=system_messages,
                         input=input_list,
+                        prompt_cache_key=prompt_cache_key,
                         text_format=output_format,
                         tool_choice="auto",
                         reasoning={"effort": "medium"},
@@ -285,8 +298,10 @@ class GPT(LLM):
                 })
 
         parsed_output: BaseModel|None = client_response.output_parsed
-        parsed_output_dict = parsed_output.model_dump_json(indent=2) if parsed_output else {}
-        logger.info(f"LLM Response:\n{parsed_output_dict}")
+        # Pretty-printing the whole response (often a full harness) is skipped when INFO is off
+        if logger.isEnabledFor(logging.INFO):
+            parsed_output_dict = parsed_output.model_dump_json(indent=2) if parsed_output else {}
+            logger.info("LLM Response:\n%s", parsed_output_dict)
 
         conversation_history.append({'role': 'assistant', 'content': str(parsed_output)})
 
@@ -1,7 +1,18 @@
 import enum
+import json
+
+import orjson
 
 class Status(enum.Enum):
     SUCCESS = "SUCCESS"
     FAILURE = "FAILURE"
     TIMEOUT = "TIMEOUT"
     ERROR = "ERROR"
+
+def json_loads(data: bytes | str):
+    """Parse JSON with orjson, falling back to the stdlib parser for NaN/Infinity literals"""
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # Metrics are written with json.dumps, which emits literals orjson rejects
+        return json.loads(data)
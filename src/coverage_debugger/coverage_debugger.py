@@ -345,8 +345,8 @@ class CoverageDebugger(AIAgent, Generable):
                 )
                 user_prompt = (
                     "The proposed modification covered the target block but decreased the overall reachable and hit code.\n"
-                    f"initial coverage: {json.dumps(current_coverage, indent=2)}\n"
-                    f"new coverage: {json.dumps(new_coverage, indent=2)}\n"
+                    f"initial coverage: {json.dumps(current_coverage, separators=(',', ':'))}\n"
+                    f"new coverage: {json.dumps(new_coverage, separators=(',', ':'))}\n"
                     "Your changes have been reverted." 
                     "Investigate and determine why the change led to decreased coverage.\n"
                     "If it cannot be avoided, do not propose any modification."
@@ -370,7 +370,7 @@ class CoverageDebugger(AIAgent, Generable):
         user_prompt = (
             f"The target block on line {target_block_line} is still not covered.\n"
             "Here is the current coverage status of the function:\n"
-            f"{json.dumps(coverage_status, indent=2)}\n"
+            f"{json.dumps(coverage_status, separators=(',', ':'))}\n"
             "Your proposed changes have been reverted. Please update harness or Makefile to cover the target block line.\n"
         )
         return (AgentAction.RETRY_BLOCK, user_prompt, current_coverage, "block_not_covered")
@@ -635,8 +635,7 @@ class CoverageDebugger(AIAgent, Generable):
                 if user_prompt:
                     user_prompt = prompt_prefix + user_prompt
             elif llm_result == AgentAction.SKIP_BLOCK or attempts >= self._max_attempts:
-                self.restore_backup(tag)
-                self.discard_backup(tag)
+                self.restore_backup(tag, discard=True)
                 functions_to_skip.setdefault(next_function['function'], set()).add(target_block_line)
                 self.log_task_result(task_id, False, attempts)
                 get_next_block = True
@@ -652,8 +651,7 @@ class CoverageDebugger(AIAgent, Generable):
                     targetLine=target_block_line,
                 )
             elif llm_result == AgentAction.TERMINATE:
-                self.restore_backup(tag)
-                self.discard_backup(tag)
+                self.restore_backup(tag, discard=True)
                 self.log_task_result(task_id, False, attempts)
                 break
 
@@ -1,6 +1,7 @@
 """ Debugger class"""
 
 # System
+from functools import lru_cache
 from typing import Optional
 from pathlib import Path
 import subprocess
@@ -16,7 +17,7 @@ from agent import AIAgent
 from commons.models import GPT, Generable
 from debugger.output_models import ModelOutput
 from logger import setup_logger
-from commons.utils import Status
+from commons.utils import Status, json_loads
 from debugger.dereference_handler import DerefereneErrorHandler
 
 # OLD
@@ -28,6 +29,13 @@ from validator.precondition_validator import PreconditionValidator
 logger = setup_logger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _load_prompt(prompt_name: str) -> str:
+    # Templates are fixed for the run, so each is read and stripped of comments once
+    with open(f"prompts/debugger/{prompt_name}.prompt", encoding="utf-8") as f:
+        return "".join(line for line in f if not line.lstrip().startswith("#"))
+
+
 class ProofDebugger(AIAgent, Generable):
     """Agentic Proof Debugger"""
 
@@ -88,7 +96,7 @@ class ProofDebugger(AIAgent, Generable):
             result = None
             # First, we try to fix the error programmatically
             if error.cluster == "deref_null":
-                result = self.generate_fix_programmatically(error, current_coverage)
+                result = self.generate_fix_programmatically(error, current_coverage, error_report)
             # If not successful, we use the LLM to fix it
             if result:
                 total_errors_solved += 1
@@ -102,7 +110,9 @@ class ProofDebugger(AIAgent, Generable):
                 )
             else:
                 self.restore_backup(tag)
-                result, current_coverage = self.generate_fix_with_llm(error, current_coverage, tag)
+                result, current_coverage = self.generate_fix_with_llm(
+                    error, current_coverage, tag, error_report,
+                )
                 if result: # LLM fix succeeded
                     total_errors_solved += 1
                     self.emit_refinement_accepted(
@@ -113,15 +123,17 @@ class ProofDebugger(AIAgent, Generable):
                         mode="llm",
                     )
                 else:
-                    self.restore_backup(tag)
+                    self.restore_backup(tag, discard=True)
             
             errors_to_skip.add(error.error_id)
-            self.discard_backup(tag)
-            error_clusters = extract_errors_and_payload(self.harness_file_name, self.harness_file_path)
-            error_report = ErrorReport(
-                error_clusters
-            )
-            logger.info("Unresolved Errors: %i", len(error_report.errors_by_line))
+            # A failed fix restores the harness and build, so the report only changes on success
+            if result:
+                self.discard_backup(tag)
+                error_clusters = extract_errors_and_payload(self.harness_file_name, self.harness_file_path)
+                error_report = ErrorReport(
+                    error_clusters
+                )
+                logger.info("Unresolved Errors: %i", len(error_report.errors_by_line))
             error = self.__pop_error(error_report, errors_to_skip)
         current_coverage = self.get_overall_coverage()
         logger.info(f"[INFO] Final Overall Coverage: {json.dumps(current_coverage, indent=2)}")
@@ -131,7 +143,7 @@ class ProofDebugger(AIAgent, Generable):
             "final_errors": final_errors,
             "errors_solved": total_errors_solved,
             "errors_solved_programatically": errors_solved_programatically,
-            "debugger_final_coverage": self.get_overall_coverage(),
+            "debugger_final_coverage": current_coverage,
         })
         self.validator.complete_validation()
         self.save_status('debugger')
@@ -149,17 +161,16 @@ class ProofDebugger(AIAgent, Generable):
         """
         if property_file_path is None:
             property_file_path = os.path.join(self.harness_dir, "build/report/json/viewer-property.json")
-        
-        if not os.path.exists(property_file_path):
-            logger.error(f"[ERROR] Property report not found: {property_file_path}")
-            return -1
 
         try:
-            with open(property_file_path, "r") as f:
-                property_data = json.load(f)
+            with open(property_file_path, "rb") as f:
+                property_data = json_loads(f.read())
             
             properties = property_data.get("viewer-property", {}).get("properties", {})
             return len(properties)
+        except FileNotFoundError:
+            logger.error(f"[ERROR] Property report not found: {property_file_path}")
+            return -1
         except Exception as e:
             logger.error(f"[ERROR] Failed to read property file: {e}")
             return -1
@@ -191,8 +202,8 @@ class ProofDebugger(AIAgent, Generable):
         diff_command = f"diff {backup_property_path} {current_property_path}"
         diff_result = self.execute_command(diff_command, workdir=self.harness_dir, timeout=60)
         
-        logger.info(f"Diff stdout:\n {diff_result.get('stdout', '')}")
-        logger.info(f"Diff stderr:\n {diff_result.get('stderr', '')}")
+        logger.info("Diff stdout:\n %s", diff_result.get('stdout', ''))
+        logger.info("Diff stderr:\n %s", diff_result.get('stderr', ''))
         
         diff_output = diff_result.get("stdout", "")
         
@@ -213,10 +224,17 @@ class ProofDebugger(AIAgent, Generable):
         
         return removed_properties, diff_output
 
-    def _get_unresolved_error_snapshot(self) -> tuple[int, set[str]]:
-        """Return the current unresolved error count and grouped function:line keys."""
-        error_clusters = extract_errors_and_payload(self.harness_file_name, self.harness_file_path)
-        error_report = ErrorReport(error_clusters)
+    def _get_unresolved_error_snapshot(
+        self,
+        error_report: Optional[ErrorReport] = None,
+    ) -> tuple[int, set[str]]:
+        """Return the current unresolved error count and grouped function:line keys.
+
+        An error_report that already reflects the current build is reused instead of re-parsing it.
+        """
+        if error_report is None:
+            error_clusters = extract_errors_and_payload(self.harness_file_name, self.harness_file_path)
+            error_report = ErrorReport(error_clusters)
         return len(error_report.errors_by_line), set(error_report.errors_by_line.keys())
 
     def _get_unresolved_error_regression(
@@ -229,10 +247,15 @@ class ProofDebugger(AIAgent, Generable):
         introduced_lines = sorted(current_lines - baseline_lines)
         return current_count > baseline_count, current_count, introduced_lines
     
-    def generate_fix_programmatically(self, error: CBMCError, current_coverage: dict) -> bool:
+    def generate_fix_programmatically(
+        self,
+        error: CBMCError,
+        current_coverage: dict,
+        error_report: Optional[ErrorReport] = None,
+    ) -> bool:
             
         """Generate the fix of a given error using programmatic handler"""
-        baseline_error_count, baseline_error_lines = self._get_unresolved_error_snapshot()
+        baseline_error_count, baseline_error_lines = self._get_unresolved_error_snapshot(error_report)
         updated_harness = self.programmatic_handler.analyze(error)
         if not updated_harness:
             logger.error("Programmatic handler could not analyze the error.")
@@ -274,8 +297,8 @@ class ProofDebugger(AIAgent, Generable):
             logger.error(f"[ERROR] JSON report path not found: {json_report_path}")
             return 
 
-        with open(os.path.join(json_report_path, "viewer-trace.json"), 'r') as file:
-            error_traces = json.load(file)
+        with open(os.path.join(json_report_path, "viewer-trace.json"), 'rb') as file:
+            error_traces = json_loads(file.read())
 
         error_trace = error_traces.get('viewer-trace', {}).get('traces', {}).get(error.error_id, {})
         
@@ -290,8 +313,8 @@ class ProofDebugger(AIAgent, Generable):
         diff_command = f"diff {harness_backup_path} {self.harness_file_name}"
         diff_result = self.execute_command(diff_command, workdir=self.harness_dir, timeout=60)
 
-        logger.info(f"Stdout:\n {diff_result.get('stdout', '')}")
-        logger.info(f"Stderr:\n {diff_result.get('stderr', '')}")
+        logger.info("Stdout:\n %s", diff_result.get('stdout', ''))
+        logger.info("Stderr:\n %s", diff_result.get('stderr', ''))
 
         if diff_result.get("exit_code") != 1 and diff_result.get("exit_code") != 0:
             logger.error("[ERROR] Diff command failed.")
@@ -476,12 +499,11 @@ class ProofDebugger(AIAgent, Generable):
 
     def handle_tool_calls(self, tool_name, function_args):
         """Handle tool calls, including the proof_validator tool."""
-        logging_text = f"""
+        logger.info("""
         Function call: 
-        Name: {tool_name} 
-        Args: {function_args}
-        """
-        logger.info(logging_text)
+        Name: %s 
+        Args: %s
+        """, tool_name, function_args)
         function_args_parsed = json.loads(function_args)
 
         if tool_name == "proof_validator":
@@ -502,17 +524,23 @@ class ProofDebugger(AIAgent, Generable):
         else:
             raise ValueError(f"Unknown function call: {tool_name}")
 
-        logger.info(f"Function call response:\n {tool_response}")
+        logger.info("Function call response:\n %s", tool_response)
         return str(tool_response)
 
     # ---------- LLM fix generation ----------
 
-    def generate_fix_with_llm(self, error: CBMCError, current_coverage: dict, tag: str) -> tuple[bool, dict]:
+    def generate_fix_with_llm(
+        self,
+        error: CBMCError,
+        current_coverage: dict,
+        tag: str,
+        error_report: Optional[ErrorReport] = None,
+    ) -> tuple[bool, dict]:
         """Generate the fix of a given error using the LLM with proof_validator tool."""
         cause_of_failure = None
         conversation_history = []
         attempt = 0
-        baseline_error_count, baseline_error_lines = self._get_unresolved_error_snapshot()
+        baseline_error_count, baseline_error_lines = self._get_unresolved_error_snapshot(error_report)
 
         self.create_error_trace_file(error)
 
@@ -520,7 +548,7 @@ class ProofDebugger(AIAgent, Generable):
         self._current_error = error
         self._current_coverage = current_coverage
         self._initial_property_count = self.get_property_count()
-        logger.info(f"Initial property count: {self._initial_property_count}")
+        logger.info("Initial property count: %s", self._initial_property_count)
 
         self._error_covered_initially = self.__is_error_covered(error)
         if not self._error_covered_initially:
@@ -669,7 +697,7 @@ class ProofDebugger(AIAgent, Generable):
             user_prompt = user_prompt.replace("{harness_dir}", self.harness_dir) 
             if error.vars:
                 user_prompt = user_prompt.replace(
-                    "{variables}", json.dumps(error.vars, indent=4))
+                    "{variables}", json.dumps(error.vars, separators=(",", ":")))
                 
             harness_content = self.get_harness()
             makefile_content = self.get_makefile()
@@ -701,7 +729,7 @@ class ProofDebugger(AIAgent, Generable):
             user_prompt = self.__get_prompt("error_not_fixed_user")
             if error.vars:
                 user_prompt = user_prompt.replace(
-                    "{variables}", json.dumps(error.vars, indent=4)
+                    "{variables}", json.dumps(error.vars, separators=(",", ":"))
                 )
             return user_prompt
         if cause_of_failure["reason"] == "properties_reduced":
@@ -760,8 +788,7 @@ class ProofDebugger(AIAgent, Generable):
         return error[2]
 
     def __get_prompt(self, prompt_name: str) -> str:
-        with open(f"prompts/debugger/{prompt_name}.prompt", encoding="utf-8") as f:
-            return "".join(line for line in f if not line.lstrip().startswith("#"))
+        return _load_prompt(prompt_name)
 
     def __get_advice(self, cluster: str):
         return get_advice_for_cluster(cluster, self.harness_file_name)
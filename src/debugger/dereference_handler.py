@@ -1,6 +1,7 @@
 """Dereference handler"""
 
 # System
+from itertools import islice
 from typing import Optional
 import re
 import os
@@ -11,6 +12,13 @@ from logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Matched against every trace step and source line, so compile them once
+NULL_MEMBER_DEREF_RE = re.compile(r"dereference failure: pointer NULL in ([_a-zA-Z]+)->[_a-zA-Z]+")
+NULL_POINTER_DEREF_RE = re.compile(r"dereference failure: pointer NULL in \*([_a-zA-Z]+)")
+VARIABLE_ASSIGNMENT_RE = re.compile(r"= ?(?:\([\w \*]+\))? ?([-\w>]+);")
+FUNCTION_ASSIGNMENT_RE = re.compile(r"(\w+) ?= ?(?:\(\w+ ?\*?\)) ?(\w+) ?\(\w*\);")
+CALL_ARGUMENTS_RE = re.compile(r'\(([^)]*)\)')
+
 
 class DerefereneErrorHandler(ErrorHandler):
     """Handle programatically dereferences to a NULL"""
@@ -54,16 +62,10 @@ class DerefereneErrorHandler(ErrorHandler):
         for index, step in reversed(list(enumerate(steps))):
             if "detail" in step and "property" in step["detail"]:
                 if step["detail"]["property"] == error_id:
-                    match_result = re.match(
-                        r"dereference failure: pointer NULL in ([_a-zA-Z]+)->[_a-zA-Z]+",
-                        step["detail"]["reason"],
-                    )
+                    match_result = NULL_MEMBER_DEREF_RE.match(step["detail"]["reason"])
                     if match_result:
                         return index, match_result.group(1)
-                    match_result = re.match(
-                        r"dereference failure: pointer NULL in \*([_a-zA-Z]+)",
-                        step["detail"]["reason"],
-                    )
+                    match_result = NULL_POINTER_DEREF_RE.match(step["detail"]["reason"])
                     if match_result:
                         return index, match_result.group(1)
         return None
@@ -86,17 +88,15 @@ class DerefereneErrorHandler(ErrorHandler):
         """Get the new variable to track"""
         file_path = steps[step_index]["location"]["file"]
         line_number = steps[step_index]["location"]["line"]
-        with open(os.path.join(self.root_dir, file_path), "r", encoding="utf-8") as file:
-            line = file.readlines()[line_number - 1]
+        line = self.__read_source_line(file_path, line_number)
         logger.info("Path: %s", os.path.join(self.root_dir, file_path))
         logger.info("linenumber: %s", line_number)
         logger.info("Line: %s", line)
-        match_result = re.search(r"= ?(?:\([\w \*]+\))? ?([-\w>]+);", line)
+        match_result = VARIABLE_ASSIGNMENT_RE.search(line)
         if match_result:  # Variable
             logger.info("new var: %s", match_result.group(1))
             return step_index, match_result.group(1), False
-        match_result = re.search(
-            r"(\w+) ?= ?(?:\(\w+ ?\*?\)) ?(\w+) ?\(\w*\);", line)
+        match_result = FUNCTION_ASSIGNMENT_RE.search(line)
         if match_result:  # Function
             if match_result.group(2) == "malloc" and "_harness.c" in file_path:
                 logger.info("Malloc var: %s", match_result.group(1))
@@ -110,11 +110,18 @@ class DerefereneErrorHandler(ErrorHandler):
         line_number: int,
     ) -> Optional[str]:
         """ Get the name of an argument given a function"""
-        with open(os.path.join(self.root_dir, file_path), "r", encoding="utf-8") as file:
-            line = file.readlines()[line_number - 1]
-        args = re.findall(r'\(([^)]*)\)', line)
+        line = self.__read_source_line(file_path, line_number)
+        args = CALL_ARGUMENTS_RE.findall(line)
         if args:
             arg_list = [a.strip() for a in args[-1].split(',') if a.strip()]
             if argument_index - 1 < len(arg_list):
                 return arg_list[argument_index - 1]
         return None
+
+    def __read_source_line(self, file_path: str, line_number: int) -> str:
+        """Read a single line, stopping there instead of loading the whole file"""
+        with open(os.path.join(self.root_dir, file_path), "r", encoding="utf-8") as file:
+            line = next(islice(file, line_number - 1, None), None)
+        if line is None:
+            raise IndexError(f"Line {line_number} is past the end of {file_path}")
+        return line
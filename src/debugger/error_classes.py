@@ -3,7 +3,7 @@ class CoverageError(Exception):
     Exception raised when an error is no longer covered by the current harness
     """
     def __init__(self, message, lines):
-        super().__init__(self, message)
+        super().__init__(message)
         self.missed_lines = lines
 
 
@@ -12,7 +12,7 @@ class PreconditionError(Exception):
     Exception raised when an error is no longer covered by the current harness
     """
     def __init__(self, message, errors):
-        super().__init__(self, message)
+        super().__init__(message)
         self.new_errors = errors
 
 class InsertError(Exception):
@@ -20,7 +20,7 @@ class InsertError(Exception):
     Exception raised when an error occurs while inserting a precondition into the harness
     """
     def __init__(self, message, prev_line, next_line, func):
-        super().__init__(self, message)
+        super().__init__(message)
         self.prev_line = prev_line
         self.next_line = next_line
-        self.func = func
\ No newline at end of file
+        self.func = func
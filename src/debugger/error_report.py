@@ -161,8 +161,8 @@ class ErrorReport:
                 results_report['processed_errors']['failure'][err_id] = err.get_err_report()
             else:
                 results_report['processed_errors']['success'][err_id] = err.get_err_report()
-                results_report['preconditions_added'].extend(err.added_precons)
+                results_report['preconditions_added'].extend(err.added_precons or [])
 
-            return results_report
+        return results_report
         
         
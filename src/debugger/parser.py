@@ -7,8 +7,41 @@ from bs4 import BeautifulSoup
 from collections import defaultdict
 import json
 import sys
+from commons.utils import json_loads
 from debugger.error_classes import CoverageError, PreconditionError
 
+# Patterns matched once per error or per trace step, compiled once at import
+ERROR_CLUSTER_PATTERNS = [
+    (re.compile(r'memcpy source region readable'), 'memcpy_src'),
+    (re.compile(r'memcpy destination region writeable'), 'memcpy_dest'),
+    (re.compile(r"memcpy src/dst overlap"), "memcpy_overlap"),
+    (re.compile(r'arithmetic overflow'), 'arithmetic_overflow'),
+    (re.compile(r"dereference failure: pointer NULL"), 'deref_null'),
+    (re.compile(r"dereference failure: pointer outside object bounds in .*\["), 'deref_arr_oob'),
+    (re.compile(r"dereference failure: pointer outside object bounds in .*->"), 'deref_obj_oob'),
+]
+NULL_DEREF_RE = re.compile(r'dereference failure: pointer NULL')
+HARNESS_FILE_RE = re.compile(r'.*_harness.c')
+TRACE_MSG_RE = re.compile(r'\s*\[trace\]\s*((?:[^\s]+\s?)+)\s*')
+TRACE_ID_RE = re.compile(r'\s*\[<a href="./traces/(.+).html">trace</a>\]\s*')
+FUNCTION_NAME_RE = re.compile(r'Function ([a-zA-Z0-9_]+)')
+LINE_NUMBER_RE = re.compile(r'\s*Line (\d+)')
+ARRAY_INDEX_RE = re.compile(r'\[\d+\]')
+INDEXED_KEY_RE = re.compile(r'(.*)\[(\d+)\]')
+WHITESPACE_RE = re.compile(r'\s+')
+CALL_STEP_RE = re.compile(r'Step \d+: Function (.*), File (.*), Line (\d+)')
+
+# convert_c_struct_to_json rewrites every struct-valued trace variable with these
+UNSIGNED_SUFFIX_RE = re.compile(r'(\d+)u(?:ll)?')
+SCALAR_ARRAY_RE = re.compile(r'{\s*((?:[0-9\-]|\'.*\'|&.*)+(?:\s*,\s*(?:[0-9\-]|\'.*\'|&.*)+)*)\s*}')
+FIELD_NAME_RE = re.compile(r'\.([$a-zA-Z_][a-zA-Z0-9_]*)\s*=')
+CHAR_LITERAL_RE = re.compile(r'\'(.)\'')
+NULL_POINTER_RE = re.compile(r'((?:\(\([^)]+(?:\(\*\)\([^()]*\))?\)\s*)?NULL\)?(?: \+ \d+)?)')
+INVALID_POINTER_RE = re.compile(r'INVALID(-\d+)?')
+ENUM_VALUE_RE = re.compile(r'/\*enum\*/([A-Z_][A-Z0-9_]*)')
+OBJECT_POINTER_RE = re.compile(r'(&[A-Za-z0-9_\$\.]+)')
+BOOLEAN_RE = re.compile(r'(TRUE|FALSE)')
+
 def run_command(command, cwd=None):
 
     """Runs a shell command and handles errors."""
@@ -25,34 +58,34 @@ def convert_c_struct_to_json(struct_str):
     """
     # Problem comes from a statically defined array of struct POINTERS
 
-    json_str = re.sub('\n', '', struct_str)
+    json_str = struct_str.replace('\n', '')
 
     # Step 1: Remove 'u' suffix from unsigned integers
-    json_str = re.sub(r'(\d+)u(?:ll)?', r'\1', json_str)
+    json_str = UNSIGNED_SUFFIX_RE.sub(r'\1', json_str)
 
     # Step 2: Convert C-style arrays of ints or chars to JSON arrays
-    json_str = re.sub(r'{\s*((?:[0-9\-]|\'.*\'|&.*)+(?:\s*,\s*(?:[0-9\-]|\'.*\'|&.*)+)*)\s*}', r'[\1]', json_str)
+    json_str = SCALAR_ARRAY_RE.sub(r'[\1]', json_str)
     
     # Step 3: Replace field names (.field=) with JSON keys ("field":)
-    json_str = re.sub(r'\.([$a-zA-Z_][a-zA-Z0-9_]*)\s*=', r'"\1":', json_str)\
+    json_str = FIELD_NAME_RE.sub(r'"\1":', json_str)
 
     # Step 4: Convert C chars to ints for easier parsing
-    json_str = re.sub(r'\'(.)\'', str(ord(r'\1'[0])), json_str)
+    json_str = CHAR_LITERAL_RE.sub(str(ord(r'\1'[0])), json_str)
 
     # Step 5: Remove type casts like ((type*)NULL), and function ptr casts like 
-    json_str = re.sub(r'((?:\(\([^)]+(?:\(\*\)\([^()]*\))?\)\s*)?NULL\)?(?: \+ \d+)?)', r'"\1"', json_str)
+    json_str = NULL_POINTER_RE.sub(r'"\1"', json_str)
     
     # Step 5.5: Deal with this invalid-XXX value that CBMC can sometimes assign to pointers by treating it like NULL
-    json_str = re.sub(r'INVALID(-\d+)?', '"NULL"', json_str)
+    json_str = INVALID_POINTER_RE.sub('"NULL"', json_str)
 
     # Step 6: Handle enum values (/*enum*/VALUE)
-    json_str = re.sub(r'/\*enum\*/([A-Z_][A-Z0-9_]*)', r'"\1"', json_str)
+    json_str = ENUM_VALUE_RE.sub(r'"\1"', json_str)
     
     # Step 7: Turn dynamic object pointers into strings:
-    json_str = re.sub(r'(&[A-Za-z0-9_\$\.]+)', r'"\1"', json_str)
+    json_str = OBJECT_POINTER_RE.sub(r'"\1"', json_str)
 
     # Step 8: Convert C-style booleans (true/false) to JSON booleans
-    json_str = re.sub(r'(TRUE|FALSE)', lambda m: 'true' if m.group(0) == 'TRUE' else 'false', json_str)
+    json_str = BOOLEAN_RE.sub(lambda m: 'true' if m.group(0) == 'TRUE' else 'false', json_str)
 
     # Custom parsing logic for struct arrays, as they're too complex to deal with using regex
     open_bracket_stack = []
@@ -80,22 +113,10 @@ def convert_c_struct_to_json(struct_str):
         return None
 
 def get_error_cluster(error_msg):
-    if re.match(r'memcpy source region readable', error_msg):
-        return 'memcpy_src'
-    elif re.match(r'memcpy destination region writeable', error_msg):
-        return 'memcpy_dest'
-    elif re.match(r"memcpy src/dst overlap", error_msg):
-        return "memcpy_overlap"
-    elif re.match(r'arithmetic overflow', error_msg):
-        return 'arithmetic_overflow'
-    elif re.match(r"dereference failure: pointer NULL", error_msg):
-        return 'deref_null'
-    elif re.match(r"dereference failure: pointer outside object bounds in .*\[", error_msg):
-        return 'deref_arr_oob'
-    elif re.match(r"dereference failure: pointer outside object bounds in .*->", error_msg):
-        return 'deref_obj_oob'
-    else:
-        return 'misc'
+    for pattern, cluster in ERROR_CLUSTER_PATTERNS:
+        if pattern.match(error_msg):
+            return cluster
+    return 'misc'
 
 def convert_python_to_c_struct(json_obj):
     """
@@ -175,7 +196,7 @@ def analyze_error_report(errors_div, report_dir, new_precon_lines=[]):
             # Get the li holding line info
             error_report = li.find('li')
             while error_report is not None:
-                func_name_found = re.search(r'Function ([a-zA-Z0-9_]+)', error_report.text)
+                func_name_found = FUNCTION_NAME_RE.search(error_report.text)
                 
                 if func_name_found:
                     func_name = func_name_found.group(1)
@@ -194,14 +215,14 @@ def analyze_error_report(errors_div, report_dir, new_precon_lines=[]):
                 for error_block in error_report.find('ul').find_all('li', recursive=False):
 
 
-                    error_msgs = set(re.findall(r'\[trace\]\s*((?:[^\s]+\s?)+)\s*',error_block.text))
+                    error_msgs = set(TRACE_MSG_RE.findall(error_block.text))
 
                     if len(error_msgs) > 1:
-                        is_null_pointer_deref = any(re.match(r'dereference failure: pointer NULL', msg) for msg in error_msgs)
+                        is_null_pointer_deref = any(NULL_DEREF_RE.match(msg) for msg in error_msgs)
                     else:
                         is_null_pointer_deref = False
 
-                    line_num_found = re.search(r'\s*Line (\d+)',error_block.text)
+                    line_num_found = LINE_NUMBER_RE.search(error_block.text)
                                          
                     if line_num_found:
                         line_num = int(line_num_found.group(1))
@@ -209,12 +230,12 @@ def analyze_error_report(errors_div, report_dir, new_precon_lines=[]):
                         raise ValueError("Couldn't find line number in error report")
 
                     
-                    if func_file_path != None and re.match(r'.*_harness.c', func_file_path):
+                    if func_file_path != None and HARNESS_FILE_RE.match(func_file_path):
                         if line_num in new_precon_lines:
                             # If this error was caused by a precondition that was added, then return an error to the LLM
                             # I think we can assume that this will always be the newest added precondition
 
-                            new_errors = [re.match(r'\s*\[trace\]\s*((?:[^\s]+\s?)+)\s*',error_line.text).group(1).strip() for error_line in error_block.find('ul').find_all('li', recursive=False)]
+                            new_errors = [TRACE_MSG_RE.match(error_line.text).group(1).strip() for error_line in error_block.find('ul').find_all('li', recursive=False)]
                             raise PreconditionError(f"ERROR: Precondition inserted at line {line_num} introduced new errors to harness", errors=new_errors)
 
 
@@ -225,8 +246,8 @@ def analyze_error_report(errors_div, report_dir, new_precon_lines=[]):
                                 line_num -= 1
 
                     for error_line in error_block.find('ul').find_all('li', recursive=False):
-                        error_id = re.match(r'\s*\[<a href="./traces/(.+).html">trace</a>\]\s*', error_line.decode_contents()).group(1).strip()
-                        error_msg = re.match(r'\s*\[trace\]\s*((?:[^\s]+\s?)+)\s*',error_line.text).group(1).strip()
+                        error_id = TRACE_ID_RE.match(error_line.decode_contents()).group(1).strip()
+                        error_msg = TRACE_MSG_RE.match(error_line.text).group(1).strip()
                         trace_link = error_line.find("a", text='trace')
                         trace_href = os.path.join(report_dir, trace_link['href'] if trace_link else None)                    
                         # Skip pointer relations and redundant derefs
@@ -251,8 +272,8 @@ def analyze_error_report(errors_div, report_dir, new_precon_lines=[]):
     return error_clusters, undefined_funcs
 
 def analyze_traces(extracted_errors, json_path, new_precon_lines=[]):
-    with open(os.path.join(json_path, "viewer-trace.json"), 'r') as file:
-        error_traces = json.load(file)
+    with open(os.path.join(json_path, "viewer-trace.json"), 'rb') as file:
+        error_traces = json_loads(file.read())
     
     html_files = dict()
     for errors in extracted_errors.values():
@@ -269,7 +290,7 @@ def analyze_traces(extracted_errors, json_path, new_precon_lines=[]):
                 
                 # Skip over lines that are not variable assignments and that are not in the harness file (where preconditions can be applied)
                 # Null function indicates global var assignment which we need
-                if not (trace['location']['function'] is None or re.match(r'.*_harness.c', trace['location']['file'])) or trace['kind'] != 'variable-assignment': 
+                if not (trace['location']['function'] is None or HARNESS_FILE_RE.match(trace['location']['file'])) or trace['kind'] != 'variable-assignment': 
                     continue
 
                 func = trace['location']['function']
@@ -303,12 +324,12 @@ def analyze_traces(extracted_errors, json_path, new_precon_lines=[]):
                 if root_var != actual_var:
                     keys = actual_var.split('.')
                     curr_scope = harness_vars[func]
-                    if re.sub(r'\[\d+\]', "", keys[0]) in harness_vars['global']:
+                    if ARRAY_INDEX_RE.sub("", keys[0]) in harness_vars['global']:
                         curr_scope = harness_vars['global']
 
                     for j, key in enumerate(keys):
                         if '[' in key: # If this is also an array index
-                            root_key, idx = re.match(r'(.*)\[(\d+)\]', key).groups()
+                            root_key, idx = INDEXED_KEY_RE.match(key).groups()
                             idx = int(idx)
                             # Root key must already exist if we're writing to an index
                             if j != len(keys) - 1: 
@@ -338,7 +359,7 @@ def analyze_traces(extracted_errors, json_path, new_precon_lines=[]):
             for func, func_vars in harness_vars.items():
                 for key, var in func_vars.items():
                     if isinstance(var, dict) or isinstance(var, list):
-                        harness_vars[func][key] = re.sub(r'\s+', ' ', convert_python_to_c_struct(var))
+                        harness_vars[func][key] = WHITESPACE_RE.sub(' ', convert_python_to_c_struct(var))
             error['harness_vars'] = harness_vars
 
             func_calls = soup.find_all("div", class_="function-call")[1:] # Skip over the CPROVER_initialize call
@@ -368,7 +389,7 @@ def analyze_traces(extracted_errors, json_path, new_precon_lines=[]):
                     m = re.match(r'(?:\.+/)?((?:.*)\.c)', func_call.find("a")['href'])
                     if m:
                         error['file'] = m.group(1)
-                caller_func_name, file_name, line_num = re.match(r'Step \d+: Function (.*), File (.*), Line (\d+)', func_call.text).groups()
+                caller_func_name, file_name, line_num = CALL_STEP_RE.match(func_call.text).groups()
                 line_num = int(line_num)
                 if caller_func_name == 'None':
                     break
@@ -482,8 +503,8 @@ def extract_func_definitions(html_files, report_dir, undefined_funcs):
 
 def check_error_is_covered(error, json_report_dir, new_lines=[]):
     try:
-        with open(os.path.join(json_report_dir, "viewer-coverage.json"), 'r') as file:
-            coverage_data = json.load(file)['viewer-coverage']['coverage']
+        with open(os.path.join(json_report_dir, "viewer-coverage.json"), 'rb') as file:
+            coverage_data = json_loads(file.read())['viewer-coverage']['coverage']
             file = error.file
             if error.is_built_in:
                 func, line_num = error.stack[1]
@@ -491,7 +512,7 @@ def check_error_is_covered(error, json_report_dir, new_lines=[]):
                 func = error.func
                 line_num = int(error.line)
 
-            if re.match(r'.*_harness.c', error.file) and not line_num in new_lines:
+            if HARNESS_FILE_RE.match(error.file) and not line_num in new_lines:
                 # If lines have been added to the harness, we need to adjust the line number for the error
                 for new_line in new_lines:
                     if line_num > new_line:
@@ -586,8 +607,8 @@ def get_json_errors(harness_path) -> set[str]:
     """Get the positive errors from the JSON resport generated by CBMC"""
     report = {}
     json_report_dir = os.path.join(harness_path, Path("build", "report", "json"))
-    with open(f"{json_report_dir}/viewer-result.json", "r", encoding="utf-8") as f:
-        report = json.loads(f.read())
+    with open(f"{json_report_dir}/viewer-result.json", "rb") as f:
+        report = json_loads(f.read())
     return set(report["viewer-result"]["results"]["false"])
 
 if __name__ == "__main__":
@@ -3,10 +3,10 @@
 # System
 from abc import ABC, abstractmethod
 from typing import Optional
-import json
 import os
 
 # AutoUP
+from commons.utils import json_loads
 from debugger.error_report import CBMCError
 from logger import setup_logger
 
@@ -39,12 +39,12 @@ class ErrorHandler(ABC):
         """Implements the specific analysis to a error"""
 
     def __load_steps(self, error_id: str) -> list:
+        # viewer-trace.json holds every trace in the report and can be large
         with open(
             os.path.join(self.report_path, "viewer-trace.json"),
-            "r",
-            encoding="utf-8",
+            "rb",
         ) as file:
-            data = json.loads(file.read())
+            data = json_loads(file.read())
         return data["viewer-trace"]["traces"][error_id]
 
     def __update_harness_content(self, variable: str, line: int) -> str:
@@ -54,8 +54,15 @@ class ErrorHandler(ABC):
             "r",
             encoding="utf-8",
         ) as file:
-            lines = file.readlines()
+            content = file.read()
         precondition = f"__CPROVER_assume({variable} != NULL);"
-        lines.insert(line, precondition + "\n")
-        updated_file = "".join(lines)
+        # Splice at the character offset of the target line instead of splitting every line
+        offset = 0
+        for _ in range(line):
+            newline = content.find("\n", offset)
+            if newline == -1:
+                offset = len(content)
+                break
+            offset = newline + 1
+        updated_file = content[:offset] + precondition + "\n" + content[offset:]
         return updated_file
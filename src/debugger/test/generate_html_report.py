@@ -1,17 +1,39 @@
-import json
-import html
-from typing import Dict, Any, List
+from typing import Dict, Any, List, TextIO
 from datetime import datetime
 
+import orjson
+
+def _dumps_indented(content: Any) -> str:
+    return orjson.dumps(content, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
 # 95% of this code was generated using Claude 4
 
-class HTMLTestReportGenerator:
-    def __init__(self):
-        self.html_content = []
-    
-    def generate_css(self) -> str:
-        """Generate CSS styles for the report."""
-        return """
+# Same replacements as html.escape(quote=True), applied in a single pass
+_HTML_ESCAPE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+})
+
+def _esc(value: Any) -> str:
+    """Escape a value for safe inclusion in HTML."""
+    return (value if isinstance(value, str) else str(value)).translate(_HTML_ESCAPE)
+
+def _failure_reason(response: Dict[str, Any]) -> str:
+    """Return the ' (reason)' suffix for a failed raw response, or an empty string."""
+    reason = response.get('reason_for_failure')
+    return "" if reason is None else f" ({reason})"
+
+_ROW_TEMPLATE = "<tr><td>{}</td><td>{}</td></tr>".format
+
+REPORT_WRITE_BUFFER_SIZE = 1 << 20
+
+# Token counts never carry success/failed/resolved values, so skip the styling checks
+_UNSTYLED_TITLES = {"Token Usage", "Total Token Usage"}
+
+_CSS_BLOCK = """
         <style>
             * {
                 box-sizing: border-box;
@@ -232,10 +254,8 @@ class HTMLTestReportGenerator:
             }
         </style>
         """
-    
-    def generate_javascript(self) -> str:
-        """Generate JavaScript for interactive features."""
-        return """
+
+_JS_BLOCK = """
         <script>
             function searchReport() {
                 const searchTerm = document.getElementById('searchBox').value.toLowerCase();
@@ -265,30 +285,26 @@ class HTMLTestReportGenerator:
                     detail.open = false;
                 });
             }
-            
-            // Syntax highlighting for JSON
-            function highlightJSON() {
-                document.querySelectorAll('.json-content').forEach(element => {
-                    let content = element.textContent;
-                    try {
-                        const parsed = JSON.parse(content);
-                        element.innerHTML = JSON.stringify(parsed, null, 2);
-                    } catch (e) {
-                        // Keep original content if not valid JSON
-                    }
-                });
-            }
-            
-            document.addEventListener('DOMContentLoaded', function() {
-                highlightJSON();
-            });
+
         </script>
         """
+
+class HTMLTestReportGenerator:
+    def __init__(self):
+        self.html_content = []
     
-    def dict_to_table(self, data: Dict[str, Any], title: str = "") -> str:
-        """Convert dictionary to HTML table."""
+    def generate_css(self) -> str:
+        """Generate CSS styles for the report."""
+        return _CSS_BLOCK
+    
+    def generate_javascript(self) -> str:
+        """Generate JavaScript for interactive features."""
+        return _JS_BLOCK
+    
+    def dict_to_table(self, data: Dict[str, Any], out: TextIO, title: str = "") -> None:
+        """Write dictionary as an HTML table."""
         if not data:
-            return ""
+            return
         
         # Handle nested dictionaries by flattening them
         flattened = {}
@@ -299,59 +315,72 @@ class HTMLTestReportGenerator:
             else:
                 flattened[key] = value
         
-        table_html = []
         if title:
-            table_html.append(f"<h3>{html.escape(title)}</h3>")
+            out.write(f"<h3>{_esc(title)}</h3>")
         
-        table_html.append("<table>")
-        table_html.append("<thead><tr><th>Metric</th><th>Value</th></tr></thead>")
-        table_html.append("<tbody>")
+        out.write("<table>")
+        out.write("<thead><tr><th>Metric</th><th>Value</th></tr></thead>")
+        out.write("<tbody>")
         
+        needs_style = title not in _UNSTYLED_TITLES
         for key, value in flattened.items():
-            # Add special styling for certain values
             value_str = str(value)
-            if key.lower().endswith('success') and str(value).lower() == 'true':
-                value_str = f'<span class="status-success">{value}</span>'
-            elif key.lower().endswith('failed') and str(value).lower() == 'true':
-                value_str = f'<span class="status-failed">{value}</span>'
-            elif 'resolved' in key.lower() and title != "Error Summary":
-                value_str = f'<span class="metric-highlight">{value}</span>'
-            
-            table_html.append(f"<tr><td>{html.escape(key)}</td><td>{value_str}</td></tr>")
+            # Add special styling for certain values
+            if needs_style:
+                key_lower = key.lower()
+                if key_lower.endswith('success') and value_str.lower() == 'true':
+                    value_str = f'<span class="status-success">{value_str}</span>'
+                elif key_lower.endswith('failed') and value_str.lower() == 'true':
+                    value_str = f'<span class="status-failed">{value_str}</span>'
+                elif 'resolved' in key_lower and title != "Error Summary":
+                    value_str = f'<span class="metric-highlight">{value_str}</span>'
+            
+            out.write(_ROW_TEMPLATE(_esc(key), value_str))
         
-        table_html.append("</tbody></table>")
-        return "".join(table_html)
+        out.write("</tbody></table>")
     
     def format_code_block(self, content: Any, css_class: str = "") -> str:
         """Format content as a code block."""
         if isinstance(content, dict):
-            content_str = json.dumps(content, indent=2)
+            # Already indented here, so the page no longer re-formats JSON in the browser
+            content_str = _dumps_indented(content)
         elif isinstance(content, list) and all(isinstance(item, str) for item in content):
             content_str = '\n'.join(content)
         else:
             content_str = str(content)
         
         css_class = f' class="{css_class}"' if css_class else ''
-        return f'<pre{css_class}>{html.escape(content_str)}</pre>'
+        return f'<pre{css_class}>{_esc(content_str)}</pre>'
     
-    def create_details_section(self, title: str, content: str, open_by_default: bool = True, css_class: str = "") -> str:
-        """Create HTML details/summary collapsible section."""
+    def open_details_section(self, title_html: str, out: TextIO, open_by_default: bool = True, css_class: str = "") -> None:
+        """Write the opening of an HTML details/summary collapsible section.
+
+        The title is written as-is; callers escape any untrusted parts of it.
+        """
         open_attr = "open" if open_by_default else ""
         class_attr = f' class="{css_class}"' if css_class else ''
         
-        return f"""
+        out.write(f"""
         <details {open_attr}{class_attr}>
-            <summary>{html.escape(title)}</summary>
+            <summary>{title_html}</summary>
             <div class="details-content">
-                {content}
+                """)
+    
+    def close_details_section(self, out: TextIO) -> None:
+        """Write the closing of an HTML details/summary collapsible section."""
+        out.write("""
             </div>
         </details>
-        """
+        """)
     
-    def process_harness_data(self, harness: Dict[str, Any]) -> str:
-        """Process individual harness data and return HTML content."""
-        content = []
-        
+    def create_details_section(self, title_html: str, content: str, out: TextIO, open_by_default: bool = True, css_class: str = "") -> None:
+        """Write an HTML details/summary collapsible section with an already-escaped title."""
+        self.open_details_section(title_html, out, open_by_default, css_class)
+        out.write(content)
+        self.close_details_section(out)
+    
+    def process_harness_data(self, harness: Dict[str, Any], out: TextIO) -> None:
+        """Write the HTML content for individual harness data."""
         # Basic information table
         basic_info = {
             'Success': harness.get('Success', 'Error'),
@@ -359,109 +388,108 @@ class HTMLTestReportGenerator:
             'Initial Error Count': harness.get('Initial # of Errors', 'N/A'),
             'Execution Time (s)': round(harness.get('Execution Time', 0), 2) if harness.get('Execution Time') else 'N/A'
         }
-        content.append(self.dict_to_table(basic_info, "Basic Information"))
+        self.dict_to_table(basic_info, out, "Basic Information")
         
         if "Error" in harness:
-            content.append(self.create_details_section(harness["Error"], 
-                                                       harness["Traceback"], False, "error-section"))
+            self.create_details_section(_esc(harness["Error"]), harness["Traceback"], out, False, "error-section")
 
         # Preconditions sections
         if 'Preconditions Removed' in harness and harness['Preconditions Removed']:
             precond_content = self.format_code_block(harness['Preconditions Removed'])
-            content.append(self.create_details_section("Preconditions Removed", precond_content, True, "nested-details"))
+            self.create_details_section("Preconditions Removed", precond_content, out, True, "nested-details")
         
         if 'Preconditions Added' in harness and harness['Preconditions Added']:
             precond_content = self.format_code_block(harness['Preconditions Added'])
-            content.append(self.create_details_section("Preconditions Added", precond_content, True, "nested-details"))
+            self.create_details_section("Preconditions Added", precond_content, out, True, "nested-details")
         
         # Summary and token usage tables
         if 'Summary' in harness:
-            content.append(self.dict_to_table(harness['Summary'], "Error Summary"))
+            self.dict_to_table(harness['Summary'], out, "Error Summary")
         
         if 'Total Token Usage' in harness:
-            content.append(self.dict_to_table(harness['Total Token Usage'], "Token Usage"))
+            self.dict_to_table(harness['Total Token Usage'], out, "Token Usage")
         
         # Initial Errors section
         if 'Initial Errors' in harness and harness['Initial Errors']:
-            initial_errors_html = []
-            for error_type, errors in harness['Initial Errors'].items():
-                initial_errors_html.append(f"<h4>{html.escape(error_type)}</h4>")
-                initial_errors_html.append(self.format_code_block(errors))
-            
-            initial_errors_content = "".join(initial_errors_html)
-            content.append(self.create_details_section("Initial Errors", initial_errors_content, False, "nested-details"))
+            self.open_details_section("Initial Errors", out, False, "nested-details")
+            out.writelines(
+                f"<h4>{_esc(error_type)}</h4>{self.format_code_block(errors)}"
+                for error_type, errors in harness['Initial Errors'].items()
+            )
+            self.close_details_section(out)
         
         # Processed Errors section
-        if 'Successful Errors' in harness and len(harness['Successful Errors']) > 0:
-            processed_errors_content = self.process_processed_errors(harness['Successful Errors'], mode='success')
-            content.append(self.create_details_section("Successful Errors", processed_errors_content, False, "nested-details"))
+        successful_errors = harness.get('Successful Errors')
+        if successful_errors:
+            self.open_details_section("Successful Errors", out, False, "nested-details")
+            self.process_processed_errors(successful_errors, out, mode='success')
+            self.close_details_section(out)
         
-        if 'Failed Errors' in harness and len(harness['Failed Errors']) > 0:
-            processed_errors_content = self.process_processed_errors(harness['Failed Errors'], mode='failed')
-            content.append(self.create_details_section("Failed Errors", processed_errors_content, False, "nested-details"))
-
-        return "".join(content)
+        failed_errors = harness.get('Failed Errors')
+        if failed_errors:
+            self.open_details_section("Failed Errors", out, False, "nested-details")
+            self.process_processed_errors(failed_errors, out, mode='failed')
+            self.close_details_section(out)
     
-    def process_processed_errors(self, processed_errors: List[Dict[str, Any]], mode) -> str:
-        """Process the processed errors section."""
-        content = []
-        
+    def process_processed_errors(self, processed_errors: List[Dict[str, Any]], out: TextIO, mode) -> None:
+        """Write the processed errors section."""
         for i, error in enumerate(processed_errors, 1):
-            error_content = []
+            error_msg = error.get('Error')
+            resolved = error.get('Resolved', 'N/A')
+            resolved_by = error.get('Resolved By')
+            
+            # Create collapsible section for this error
+            title_msg = 'Unknown' if error_msg is None else error_msg
+            title_html = f"Error {i}: {_esc(title_msg[:100])}..."
+            if mode == 'failed' and resolved != 'N/A' and not resolved:
+                title_html += " (UNRESOLVED)"
+            self.open_details_section(title_html, out, False, "error-section")
             
             # Error details table
             error_info = {
-                'Error': error.get('Error', 'N/A'),
+                'Error': 'N/A' if error_msg is None else error_msg,
                 'Attempts': error.get('Attempts', 'N/A'),
-                'Resolved': error.get('Resolved', 'N/A')
+                'Resolved': resolved
             }
-            if mode == 'failed' and 'Resolved By' in error:
-                error_info['Resolved By'] = error['Resolved By'][:100]
+            if mode == 'failed' and resolved_by is not None:
+                error_info['Resolved By'] = resolved_by[:100]
 
-            error_content.append(self.dict_to_table(error_info, f"Error {i} Details"))
+            self.dict_to_table(error_info, out, f"Error {i} Details")
             
             # Preconditions Added
             if 'Preconditions Added' in error:
                 precond_content = self.format_code_block(error['Preconditions Added'])
-                error_content.append(f"<h4>Preconditions Added</h4>{precond_content}")
+                out.write(f"<h4>Preconditions Added</h4>{precond_content}")
             
             # Token Usage
             if 'Token Usage' in error:
-                error_content.append(self.dict_to_table(error['Token Usage'], "Token Usage"))
+                self.dict_to_table(error['Token Usage'], out, "Token Usage")
             
             # Indirectly Resolved
-            if len(error['Indirectly Resolved']) > 0:
-                indirect_content = self.format_code_block(error['Indirectly Resolved'])
-                error_content.append(self.create_details_section("Indirectly Resolved Errors", indirect_content, False, "nested-details"))
+            indirectly_resolved = error.get('Indirectly Resolved')
+            if indirectly_resolved:
+                indirect_content = self.format_code_block(indirectly_resolved)
+                self.create_details_section("Indirectly Resolved Errors", indirect_content, out, False, "nested-details")
             
             # Raw Responses
-            if 'Raw Responses' in error and error['Raw Responses']:
-                responses_html = []
-                for j, response in enumerate(error['Raw Responses'], 1):
-                    responses_html.append(f"<h5>Response {j}{f" ({response['reason_for_failure']})" if response.get('reason_for_failure', None) != None else ""}</h5>")
-
-                    responses_html.append(self.format_code_block(response, "json-content"))
-                
-                responses_content = "".join(responses_html)
-                error_content.append(self.create_details_section("Raw Responses", responses_content, False, "nested-details"))
-            
-            # Create collapsible section for this error
-            error_section_content = "".join(error_content)
-            title_str = f"Error {i}: {error.get('Error', 'Unknown')[:100]}..."
-            if mode == 'failed' and not error.get('Resolved', True):
-                title_str += " (UNRESOLVED)"
-            error_section = self.create_details_section(title_str, error_section_content, False, "error-section")
-            content.append(error_section)
-        
-        return "".join(content)
+            raw_responses = error.get('Raw Responses')
+            if raw_responses:
+                self.open_details_section("Raw Responses", out, False, "nested-details")
+                out.writelines(
+                    f"<h5>Response {j}{_failure_reason(response)}</h5>{self.format_code_block(response, 'json-content')}"
+                    for j, response in enumerate(raw_responses, 1)
+                )
+                self.close_details_section(out)
+            
+            self.close_details_section(out)
     
     def generate_report(self, data: Dict[str, Any], output_filename: str = "test_report.html") -> str:
         """Generate HTML report from test run data."""
         
-        html_parts = []
-        
-        # HTML head
-        html_parts.append("""
+        # Stream straight to the file so the whole report is never held in memory
+        with open("./results/index.html", 'w', encoding='utf-8', buffering=REPORT_WRITE_BUFFER_SIZE) as out:
+            # HTML head
+            out.write("""
         <!DOCTYPE html>
         <html lang="en">
         <head>
@@ -470,17 +498,17 @@ class HTMLTestReportGenerator:
             <title>Test Run Report</title>
         """)
         
-        html_parts.append(self.generate_css())
-        html_parts.append("</head><body>")
+            out.write(self.generate_css())
+            out.write("</head><body>")
         
-        # Container start
-        html_parts.append('<div class="container">')
+            # Container start
+            out.write('<div class="container">')
         
-        # Title and controls
-        html_parts.append('<h1>🧪 Test Run Report</h1>')
+            # Title and controls
+            out.write('<h1>🧪 Test Run Report</h1>')
         
-        # Search and control buttons
-        html_parts.append("""
+            # Search and control buttons
+            out.write("""
         <div class="search-container">
             <input type="text" id="searchBox" class="search-box" placeholder="Search report..." onkeyup="searchReport()">
             <button onclick="expandAll()" style="margin-left: 10px; padding: 8px 12px;">Expand All</button>
@@ -488,52 +516,48 @@ class HTMLTestReportGenerator:
         </div>
         """)
         
-        # html_parts.append('<h2>Results Summary<h2>')
+            # out.write('<h2>Results Summary<h2>')
 
-        # Overall Summary section
-        if 'Summary' in data:
-            html_parts.append('<div class="summary-section">')
-            html_parts.append(self.dict_to_table(data['Summary']['Harnesses'], "Harnesses Fixed"))
-            html_parts.append(self.dict_to_table(data['Summary']['Errors'], "Errors Resolved"))
-            html_parts.append('</div>')
+            # Overall Summary section
+            if 'Summary' in data:
+                out.write('<div class="summary-section">')
+                self.dict_to_table(data['Summary']['Harnesses'], out, "Harnesses Fixed")
+                self.dict_to_table(data['Summary']['Errors'], out, "Errors Resolved")
+                out.write('</div>')
         
-        # Overall Token Usage section
-        if 'Total Token Usage' in data:
-            data['Total Token Usage']['Cost'] = self.get_cost_of_test(data['Total Token Usage'])
-            html_parts.append('<div class="summary-section">')
-            html_parts.append(self.dict_to_table(data['Total Token Usage'], "Total Token Usage"))
-            html_parts.append('</div>')
+            # Overall Token Usage section
+            if 'Total Token Usage' in data:
+                data['Total Token Usage']['Cost'] = self.get_cost_of_test(data['Total Token Usage'])
+                out.write('<div class="summary-section">')
+                self.dict_to_table(data['Total Token Usage'], out, "Total Token Usage")
+                out.write('</div>')
         
-        # Process each harness
-        if 'Harnesses' in data and data['Harnesses']:
-            for harness in data['Harnesses']:
-                harness_name = harness.get('Harness', 'Unknown Harness')
-                harness_content = self.process_harness_data(harness)
+            # Process each harness
+            if 'Harnesses' in data and data['Harnesses']:
+                for harness in data['Harnesses']:
+                    harness_name = harness.get('Harness', 'Unknown Harness')
                 
-                # Create collapsible section for entire harness
-                harness_section = self.create_details_section(f"{harness_name}{" (FAILED)" if not harness.get('Success', False) else ""}", harness_content, False, "harness-section")
-                html_parts.append(harness_section)
-        
-        # Timestamp
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        html_parts.append(f'<div class="timestamp">Report generated on {timestamp}</div>')
+                    # Create collapsible section for entire harness
+                    failed_suffix = "" if harness.get('Success', False) else " (FAILED)"
+                    self.open_details_section(f"{_esc(harness_name)}{failed_suffix}", out, False, "harness-section")
+                    self.process_harness_data(harness, out)
+                    self.close_details_section(out)
         
-        # Container end and JavaScript
-        html_parts.append('</div>')
-        html_parts.append(self.generate_javascript())
-        html_parts.append('</body></html>')
+            # Timestamp
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            out.write(f'<div class="timestamp">Report generated on {timestamp}</div>')
         
-        # Write to file
-        html_content = "".join(html_parts)
-
-        with open("./results/index.html", 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            # Container end and JavaScript
+            out.write('</div>')
+            out.write(self.generate_javascript())
+            out.write('</body></html>')
         
         print(f"HTML report generated successfully: {output_filename}")
         return output_filename
 
     def get_cost_of_test(self, token_usage):
-        return f'${round((token_usage['Input'] * 2 + token_usage['Cached'] * 0.5 + token_usage['Output'] * 8) / 1000000, 2):.2f}'
+        cost = (token_usage['Input'] * 2 + token_usage['Cached'] * 0.5 + token_usage['Output'] * 8) / 1000000
+        return f'${round(cost, 2):.2f}'
 
 def generate_html_report(data: Dict[str, Any], output_filename: str = "test_report.html") -> str:
     """Convenience function to generate HTML report."""
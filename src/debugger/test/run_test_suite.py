@@ -104,20 +104,20 @@ def _remove_preconditions_and_make_backup(settings, report):
     with open(settings['harness'], 'r') as f:
         harness_lines = f.readlines()
 
+    # Filter the lines in one pass instead of popping each one, which shifts the tail every time
+    lines_to_remove = {line for line in settings['preconditions_lines_to_remove'] if line != 'TBD'}
     removed_precons = []
-    offset = 0
-    for line in settings['preconditions_lines_to_remove']:
-        if line == 'TBD':
+    kept_lines = []
+    for line_num, line in enumerate(harness_lines, start=1):
+        if line_num not in lines_to_remove:
+            kept_lines.append(line)
             continue
-        line_index = line - offset - 1
-        precon = harness_lines.pop(line_index)
-        removed_precons.append(precon.strip())
-        if '__CPROVER_assume' not in precon:
+        removed_precons.append(line.strip())
+        if '__CPROVER_assume' not in line:
             print("WARNING: Removed non-precondition line from harness")
-        offset += 1
     
     with open(settings['harness'], 'w') as f:
-        f.writelines(harness_lines)
+        f.writelines(kept_lines)
 
     print(f"Removed {len(settings['preconditions_lines_to_remove'])} preconditions from {os.path.basename(settings['harness'])}:\n{'\n'.join(removed_precons)}")
     report['Preconditions Removed'] = removed_precons
@@ -170,8 +170,9 @@ class MakefileDebugger(AIAgent, Generable):
         self.log_task_result("makefile_debugger", status == Status.SUCCESS, attempts)
 
         if status != Status.SUCCESS:
-            self.restore_backup(tag)
-        self.discard_backup(tag)
+            self.restore_backup(tag, discard=True)
+        else:
+            self.discard_backup(tag)
 
         return status == Status.SUCCESS
 
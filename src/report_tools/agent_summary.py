@@ -2,48 +2,117 @@
 
 # System
 import argparse
-import json
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional
 
 # Utils
 import pandas as pd
 
+SRC_DIR = Path(__file__).resolve().parents[1]
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
 
-def generate_csv_file(df: pd.DataFrame, metrics_folder: str) -> None:
-    """ Creates a CSV file """
-    agent_report_file_path = os.path.join(metrics_folder, "agent_report.csv")
-    df.to_csv(agent_report_file_path)
-
-def create_dataframe_from_agent_metrics(metrics_folder: str) -> pd.DataFrame:
-    """Load data and create the dataframe with preprocessing"""
-    df = pd.DataFrame()
-    jsonl_files = os.listdir(metrics_folder)
-    jsonl_files = [file for file in jsonl_files if file.endswith(".jsonl")]
+# AutoUP
+from commons.utils import json_loads
 
-    for file in jsonl_files:
-        file_path = os.path.join(metrics_folder, file)
-        with open(file_path, "r", encoding="utf-8") as f:
-            json_list = [json.loads(line) for line in f]
 
-        # ---- Preprocess agent results ----
-        for metric in json_list:
-            if (
-                metric.get("type") == "agent_result"
-                and metric.get("agent_name") == "CoverageDebugger"
-                and metric.get("data", {}).get("final_coverage") == 1
-            ):
-                metric["data"]["final_coverage"] = metric["data"].get("initial_coverage")
+CSV_CHUNK_SIZE = 50_000
 
-        # Extract agent_result data only
-        json_list = [metric["data"] for metric in json_list if metric.get("type") == "agent_result"]
 
-        for metric in json_list:
-            metric["file"] = file
+def optimize_dtypes(df: pd.DataFrame) -> None:
+    """ Shrinks column dtypes in place without changing the values written to CSV """
+    for column in df.select_dtypes("object"):
+        values = df[column]
+        # Only string-only columns: a categorical would coerce mixed values to one type
+        if pd.api.types.infer_dtype(values, skipna=True) != "string":
+            continue
+        if values.nunique() < 0.5 * len(df):
+            df[column] = values.astype("category")
+    # Floats are left alone: downcasting them to float32 changes their CSV text
+    for column in df.select_dtypes("integer"):
+        df[column] = pd.to_numeric(df[column], downcast="integer")
 
-        df = pd.concat([df, pd.json_normalize(json_list)], ignore_index=True)
+def generate_csv_file(df: pd.DataFrame, metrics_folder: str) -> None:
+    """ Creates a CSV file """
+    agent_report_file_path = os.path.join(metrics_folder, "agent_report.csv")
+    df.to_csv(agent_report_file_path, chunksize=CSV_CHUNK_SIZE)
+
+def _flatten_nested(record: dict, prefix: str) -> dict:
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten_nested(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+def flatten_record(record: dict) -> dict:
+    """Flatten nested dicts into dotted keys, matching pd.json_normalize
+
+    Like json_normalize, top-level scalars keep their place and flattened keys follow them.
+    """
+    flat = {}
+    nested = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            nested.update(_flatten_nested(value, f"{key}."))
+        else:
+            flat[key] = value
+    flat.update(nested)
+    return flat
+
+def iter_agent_results(file_path: str) -> Iterator[dict]:
+    """Yield the data of each agent_result entry in a metrics JSONL file"""
+    file_name = os.path.basename(file_path)
+    # Both parsers accept raw bytes, so skip the text-mode decode
+    with open(file_path, "rb") as f:
+        for line in f:
+            metric = json_loads(line)
+            if metric.get("type") != "agent_result":
+                continue
+            data = metric["data"]
+            if (
+                metric.get("agent_name") == "CoverageDebugger"
+                and data.get("final_coverage") == 1
+            ):
+                data["final_coverage"] = data.get("initial_coverage")
+            data = flatten_record(data)
+            data["file"] = file_name
+            yield data
+
+def merge_agent_results(file_path: str) -> Optional[pd.DataFrame]:
+    """Merge the agent_result data of one metrics file into a single row
+
+    Each column keeps its first non-missing value via groupby().first() on this
+    file's records alone, so the row keeps the dtypes the records imply.
+    Module level so it can be pickled for worker processes.
+    """
+    records = list(iter_agent_results(file_path))
+    if not records:
+        return None
+    return pd.DataFrame(records).set_index("file").groupby(level=0).first()
 
-    df = df.set_index("file")
-    df = df.groupby(df.index).agg("first")
+def create_dataframe_from_agent_metrics(metrics_folder: str) -> pd.DataFrame:
+    """Load data and create the dataframe with preprocessing"""
+    with os.scandir(metrics_folder) as entries:
+        file_paths = [entry.path for entry in entries if entry.name.endswith(".jsonl") and entry.is_file()]
+    if len(file_paths) > 1:
+        # Files are independent, so parse and merge them in parallel worker processes
+        with ProcessPoolExecutor() as executor:
+            rows = list(executor.map(merge_agent_results, file_paths, chunksize=4))
+    else:
+        rows = [merge_agent_results(file_path) for file_path in file_paths]
+
+    # One merged row per file, so no global groupby is needed. The concat turns an
+    # integer column float when a file lacks the key, but a file that wrote an explicit
+    # null adds an object column, which keeps the integers unchanged
+    df = pd.concat([row for row in rows if row is not None])
+    df = df.sort_index()
+    optimize_dtypes(df)
     return df
 
 
@@ -35,21 +35,25 @@ def print_report(df: pd.DataFrame, file_count: int):
     print("* Total: ", df["llm_data.token_usage.total_tokens"].sum())
     print("* Average per attempt", df["llm_data.token_usage.total_tokens"].mean())
 
-def create_dataframe_from_metrics() -> pd.DataFrame:
+def list_metrics_files() -> list[str]:
+    """List the metrics files in a single directory scan"""
+    with os.scandir(METRICS_FOLDER) as entries:
+        return [entry.path for entry in entries if entry.is_file()]
+
+def create_dataframe_from_metrics(file_paths: list[str]) -> pd.DataFrame:
     """Create a Dataframe with the information of the metrics"""
-    df = pd.DataFrame()
-    jsonl_files = os.listdir(METRICS_FOLDER)
-    for file in jsonl_files:
-        file_path = os.path.join(METRICS_FOLDER, file)
+    json_list = []
+    for file_path in file_paths:
         with open(file_path, "r", encoding="utf-8") as f:
-            json_list = [json.loads(line) for line in f]
-        df = pd.concat([df, pd.json_normalize(json_list)], ignore_index=True)
-    return df
+            json_list.extend(json.loads(line) for line in f)
+    # Normalizing once avoids re-copying the growing frame for every file
+    return pd.json_normalize(json_list)
 
 def main():
     """Entry point"""
-    df = create_dataframe_from_metrics()
-    print_report(df, len(os.listdir(METRICS_FOLDER)))
+    file_paths = list_metrics_files()
+    df = create_dataframe_from_metrics(file_paths)
+    print_report(df, len(file_paths))
 
 
 if __name__ == "__main__":
@@ -248,10 +248,12 @@ class ScopeReducer:
         with open(file_path, "r", encoding="utf-8", errors="ignore") as file_handle:
             lines = file_handle.readlines()
 
+        func_name_re = re.compile(rf"\b{re.escape(func_name)}\b")
+
         for index in range(max(start_line - 1, 0), len(lines)):
             line = lines[index].strip()
 
-            if not inside_signature and re.search(rf"\b{re.escape(func_name)}\b", line):
+            if not inside_signature and func_name_re.search(line):
                 inside_signature = True
 
             if inside_signature:
@@ -262,7 +264,7 @@ class ScopeReducer:
         if not signature_lines:
             for line in lines:
                 stripped = line.strip()
-                if re.search(rf"\b{re.escape(func_name)}\b", stripped):
+                if func_name_re.search(stripped):
                     signature_lines.append(stripped)
                     if "{" in stripped or ";" in stripped:
                         break
@@ -461,8 +463,9 @@ class ScopeReducer:
                     self.agent.discard_backup(iteration_tag)
         finally:
             if not reduction_succeeded:
-                self.agent.restore_backup(reducer_tag)
-            self.agent.discard_backup(reducer_tag)
+                self.agent.restore_backup(reducer_tag, discard=True)
+            else:
+                self.agent.discard_backup(reducer_tag)
             self.agent.log_agent_result(
                 {
                     "scope_reducer_succeeded": reduction_succeeded,
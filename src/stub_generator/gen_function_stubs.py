@@ -62,12 +62,14 @@ class StubGenerator(AIAgent, Generable):
         with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
             lines = f.readlines()
 
+        func_name_re = re.compile(rf'\b{re.escape(func_name)}\b')
+
         # Start reading from the specified line (1-based index)
         for i in range(start_line - 1, len(lines)):
             line = lines[i].strip()
 
             # Start collecting once the function name appears
-            if not inside_signature and re.search(rf'\b{re.escape(func_name)}\b', line):
+            if not inside_signature and func_name_re.search(line):
                 inside_signature = True
 
             if inside_signature:
@@ -383,8 +385,9 @@ class StubGenerator(AIAgent, Generable):
             logger.error("Failed to generate compilable harness after maximum attempts.")
 
         if not generation_succeeded:
-            self.restore_backup(tag)
-        self.discard_backup(tag)
+            self.restore_backup(tag, discard=True)
+        else:
+            self.discard_backup(tag)
 
         self.log_agent_result(agent_result)
         self.save_status('stubs')
@@ -66,7 +66,7 @@ class FunctionPointerHandler(AIAgent, Generable):
 
         user_prompt = user_prompt.replace("{HARNESS_CODE}", harness_code)
         user_prompt = user_prompt.replace("{MAKEFILE_CODE}", makefile_code)
-        user_prompt = user_prompt.replace("{STUBS_REQUIRED}", json.dumps(function_pointers, indent=2))
+        user_prompt = user_prompt.replace("{STUBS_REQUIRED}", json.dumps(function_pointers, separators=(",", ":")))
         user_prompt = user_prompt.replace("{HARNESS_DIR}", self.harness_dir)   
         user_prompt = user_prompt.replace("{PROJECT_DIR}", self.root_dir)
 
@@ -7,12 +7,13 @@ def get_makefile_list_var(makefile_content, var_name):
     lines = makefile_content.splitlines()
     values = []
     inside_var = False
+    var_start_re = re.compile(rf"^{var_name}\s*[\?\+]?=")
 
     for line in lines:
         stripped = line.strip()
 
         if not inside_var:
-            if re.match(rf"^{var_name}\s*[\?\+]?=", stripped):
+            if var_start_re.match(stripped):
                 inside_var = True
                 part = re.split(r"[\?\+]?=", stripped, 1)[1].strip()
                 if part:
@@ -223,8 +223,8 @@ class VulnAwareRefiner(AIAgent, Generable):
         current_harness = self.get_harness()
 
         # Replace placeholders
-        user_prompt = user_prompt.replace("{LOOPS_WITH_FAILURES}", json.dumps(loops_info, indent=2))
-        user_prompt = user_prompt.replace("{LOOP_SOURCES}", json.dumps(loop_sources, indent=2))
+        user_prompt = user_prompt.replace("{LOOPS_WITH_FAILURES}", json.dumps(loops_info, separators=(",", ":")))
+        user_prompt = user_prompt.replace("{LOOP_SOURCES}", json.dumps(loop_sources, separators=(",", ":")))
         user_prompt = user_prompt.replace("{CURRENT_MAKEFILE}", current_makefile)
         user_prompt = user_prompt.replace("{CURRENT_HARNESS}", current_harness)
         user_prompt = user_prompt.replace("{PROJECT_DIR}", self.root_dir)
@@ -423,8 +423,7 @@ class VulnAwareRefiner(AIAgent, Generable):
                 self.restore_backup(tag)
                 user_prompt = retry_prompt
             elif action == AgentAction.SKIP or attempts >= self._max_attempts:
-                self.restore_backup(tag)
-                self.discard_backup(tag)
+                self.restore_backup(tag, discard=True)
                 self.log_task_result(task_id, False, attempts)
                 break
             elif action == AgentAction.SUCCESS:
@@ -439,8 +438,7 @@ class VulnAwareRefiner(AIAgent, Generable):
                     numLoopUnwindingsSet=llm_response.num_loop_unwindings_set,
                 )
             elif action == AgentAction.TERMINATE:
-                self.restore_backup(tag)
-                self.discard_backup(tag)
+                self.restore_backup(tag, discard=True)
                 self.log_task_result(task_id, False, attempts)
                 break
 
@@ -1,3 +1,5 @@
+import os
+import stat
 import sys
 import types
 import unittest
@@ -70,3 +72,64 @@ class AgentSaveStatusTests(unittest.TestCase):
         self.assertTrue((tmp_path / "build_backup.ABCD").is_dir())
         self.assertFalse((tmp_path / "snapshots" / "target_harness.c.ABCD.backup").exists())
         self.assertFalse((tmp_path / "snapshots" / "Makefile.ABCD.backup").exists())
+
+    def test_restore_backup_rewrites_backed_up_contents(self):
+        tmp_path = Path(self._testMethodName)
+        tmp_path.mkdir(exist_ok=True)
+        self.addCleanup(lambda: __import__("shutil").rmtree(tmp_path, ignore_errors=True))
+
+        agent = make_agent(tmp_path)
+        Path(agent.harness_file_path).write_text("original harness\n", encoding="utf-8")
+        Path(agent.makefile_path).write_text("all:\n\t@true\n", encoding="utf-8")
+
+        agent.create_backup("ABCD")
+        Path(agent.harness_file_path).write_text("edited harness\n", encoding="utf-8")
+        Path(agent.makefile_path).write_text("all:\n\t@false\n", encoding="utf-8")
+        agent.restore_backup("ABCD")
+
+        self.assertEqual(Path(agent.harness_file_path).read_text(encoding="utf-8"), "original harness\n")
+        self.assertEqual(Path(agent.makefile_path).read_text(encoding="utf-8"), "all:\n\t@true\n")
+
+        agent.discard_backup("ABCD")
+
+        self.assertFalse((tmp_path / "target_harness.c.ABCD.backup").exists())
+        self.assertFalse((tmp_path / "Makefile.ABCD.backup").exists())
+
+    def test_restore_backup_with_discard_moves_build_backup_into_place(self):
+        tmp_path = Path(self._testMethodName)
+        tmp_path.mkdir(exist_ok=True)
+        self.addCleanup(lambda: __import__("shutil").rmtree(tmp_path, ignore_errors=True))
+
+        agent = make_agent(tmp_path)
+        Path(agent.harness_file_path).write_text("original harness\n", encoding="utf-8")
+        Path(agent.makefile_path).write_text("all:\n\t@true\n", encoding="utf-8")
+        (tmp_path / "build").mkdir()
+        (tmp_path / "build" / "result.txt").write_text("original build\n", encoding="utf-8")
+
+        agent.create_backup("ABCD")
+        Path(agent.harness_file_path).write_text("edited harness\n", encoding="utf-8")
+        (tmp_path / "build" / "result.txt").write_text("edited build\n", encoding="utf-8")
+        agent.restore_backup("ABCD", discard=True)
+
+        self.assertEqual(Path(agent.harness_file_path).read_text(encoding="utf-8"), "original harness\n")
+        self.assertEqual((tmp_path / "build" / "result.txt").read_text(encoding="utf-8"), "original build\n")
+        self.assertFalse((tmp_path / "build_backup.ABCD").exists())
+        self.assertFalse((tmp_path / "target_harness.c.ABCD.backup").exists())
+        self.assertFalse((tmp_path / "Makefile.ABCD.backup").exists())
+
+    def test_update_harness_keeps_permissions_and_cleans_up_failed_writes(self):
+        tmp_path = Path(self._testMethodName)
+        tmp_path.mkdir(exist_ok=True)
+        self.addCleanup(lambda: __import__("shutil").rmtree(tmp_path, ignore_errors=True))
+
+        agent = make_agent(tmp_path)
+        Path(agent.harness_file_path).write_text("original harness\n", encoding="utf-8")
+        os.chmod(agent.harness_file_path, 0o640)
+
+        agent.update_harness("updated harness\n")
+
+        self.assertEqual(stat.S_IMODE(os.stat(agent.harness_file_path).st_mode), 0o640)
+        with self.assertRaises(UnicodeEncodeError):
+            agent.update_harness("bad \udc80 harness\n")
+        self.assertEqual(Path(agent.harness_file_path).read_text(encoding="utf-8"), "updated harness\n")
+        self.assertFalse(Path(f"{agent.harness_file_path}.tmp").exists())
@@ -0,0 +1,143 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from report_tools.agent_summary import create_dataframe_from_agent_metrics, generate_csv_file
+
+
+def _write_jsonl(path: Path, entries: list[dict]) -> None:
+    path.write_text("".join(json.dumps(entry) + "\n" for entry in entries), encoding="utf-8")
+
+
+class AgentSummaryTests(unittest.TestCase):
+    def test_merges_agent_results_into_one_row_per_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            _write_jsonl(
+                temp_path / "first.jsonl",
+                [
+                    {"type": "agent_result", "agent_name": "InitialHarnessGenerator", "data": {"harness_ok": True}},
+                    {"type": "task_attempt", "agent_name": "debugger", "data": None},
+                    {"type": "agent_result", "agent_name": "debugger", "data": {"errors_solved": 3}},
+                ],
+            )
+            _write_jsonl(
+                temp_path / "second.jsonl",
+                [
+                    {"type": "agent_result", "agent_name": "debugger", "data": {"errors_solved": 1}},
+                    {"type": "agent_result", "agent_name": "debugger", "data": {"errors_solved": 7}},
+                ],
+            )
+            (temp_path / "notes.txt").write_text("ignored", encoding="utf-8")
+
+            df = create_dataframe_from_agent_metrics(temp_dir)
+
+            self.assertEqual(sorted(df.index), ["first.jsonl", "second.jsonl"])
+            self.assertEqual(bool(df.loc["first.jsonl", "harness_ok"]), True)
+            self.assertEqual(df.loc["first.jsonl", "errors_solved"], 3)
+            self.assertEqual(df.loc["second.jsonl", "errors_solved"], 1)
+
+    def test_coverage_debugger_full_coverage_falls_back_to_initial(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _write_jsonl(
+                Path(temp_dir) / "run.jsonl",
+                [
+                    {
+                        "type": "agent_result",
+                        "agent_name": "CoverageDebugger",
+                        "data": {"initial_coverage": 0.4, "final_coverage": 1},
+                    },
+                ],
+            )
+
+            df = create_dataframe_from_agent_metrics(temp_dir)
+
+            self.assertEqual(df.loc["run.jsonl", "final_coverage"], 0.4)
+
+    def test_loads_metrics_written_with_nan_literals(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _write_jsonl(
+                Path(temp_dir) / "run.jsonl",
+                [{"type": "agent_result", "agent_name": "debugger", "data": {"final_coverage": float("nan")}}],
+            )
+
+            df = create_dataframe_from_agent_metrics(temp_dir)
+
+            self.assertTrue(df["final_coverage"].isna().all())
+
+    def test_csv_keeps_mixed_type_values(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # The explicit null keeps run_0's column object, so True is not cast to 1
+            _write_jsonl(
+                Path(temp_dir) / "run_0.jsonl",
+                [
+                    {"type": "agent_result", "agent_name": "debugger", "data": {"flag": True}},
+                    {"type": "agent_result", "agent_name": "debugger", "data": {"flag": None}},
+                ],
+            )
+            for index in range(1, 4):
+                _write_jsonl(
+                    Path(temp_dir) / f"run_{index}.jsonl",
+                    [{"type": "agent_result", "agent_name": "debugger", "data": {"flag": 1}}],
+                )
+
+            generate_csv_file(create_dataframe_from_agent_metrics(temp_dir), temp_dir)
+
+            csv_lines = (Path(temp_dir) / "agent_report.csv").read_text(encoding="utf-8").splitlines()
+            self.assertEqual(csv_lines[1:], ["run_0.jsonl,True", "run_1.jsonl,1", "run_2.jsonl,1", "run_3.jsonl,1"])
+
+    def test_csv_matches_grouped_records_dtypes_and_column_order(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _write_jsonl(
+                Path(temp_dir) / "run.jsonl",
+                [
+                    {"type": "agent_result", "agent_name": "debugger", "data": {"coverage": {"hit": 1}, "errors_solved": 1}},
+                    {"type": "agent_result", "agent_name": "CoverageDebugger", "data": {"attempts": 2}},
+                ],
+            )
+
+            generate_csv_file(create_dataframe_from_agent_metrics(temp_dir), temp_dir)
+
+            csv_lines = (Path(temp_dir) / "agent_report.csv").read_text(encoding="utf-8").splitlines()
+            self.assertEqual(csv_lines, ["file,errors_solved,coverage.hit,attempts", "run.jsonl,1.0,1.0,2.0"])
+
+    def test_failed_initial_build_keeps_integer_errors(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _write_jsonl(
+                Path(temp_dir) / "a.jsonl",
+                [{"type": "agent_result", "agent_name": "debugger", "data": {"initial_errors": 5, "final_errors": 2, "errors_solved": 3}}],
+            )
+            # The debugger writes this record when the initial build fails
+            _write_jsonl(
+                Path(temp_dir) / "b.jsonl",
+                [{"type": "agent_result", "agent_name": "debugger", "data": {"initial_errors": None, "final_errors": None, "errors_solved": None}}],
+            )
+
+            generate_csv_file(create_dataframe_from_agent_metrics(temp_dir), temp_dir)
+
+            csv_lines = (Path(temp_dir) / "agent_report.csv").read_text(encoding="utf-8").splitlines()
+            self.assertEqual(csv_lines, ["file,initial_errors,final_errors,errors_solved", "a.jsonl,5,2,3", "b.jsonl,,,"])
+
+    def test_missing_key_makes_integer_errors_float(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _write_jsonl(
+                Path(temp_dir) / "a.jsonl",
+                [{"type": "agent_result", "agent_name": "debugger", "data": {"initial_errors": 5}}],
+            )
+            _write_jsonl(
+                Path(temp_dir) / "b.jsonl",
+                [{"type": "agent_result", "agent_name": "CoverageDebugger", "data": {"attempts": 2}}],
+            )
+
+            df = create_dataframe_from_agent_metrics(temp_dir)
+
+            self.assertEqual(df["initial_errors"].dtype, "float64")
+            self.assertEqual(df.loc["a.jsonl", "initial_errors"], 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
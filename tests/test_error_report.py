@@ -0,0 +1,36 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from debugger.error_report import ErrorReport
+
+
+class ErrorReportTests(unittest.TestCase):
+    def test_results_report_includes_every_processed_error(self):
+        report = ErrorReport(
+            {
+                "deref_null": {
+                    "err_a": {"function": "foo", "line": 10, "msg": "dereference failure: pointer NULL"},
+                    "err_b": {"function": "foo", "line": 20, "msg": "dereference failure: pointer NULL"},
+                },
+                "misc": {
+                    "err_c": {"function": "bar", "line": 5, "msg": "arithmetic overflow"},
+                },
+            }
+        )
+        for error_id in ("err_a", "err_b", "err_c"):
+            report.get_err(error_id).processed = True
+        report.get_err("err_a").added_precons = ["__CPROVER_assume(p != NULL);"]
+        report.failed_errs.add("err_c")
+
+        results = report.generate_results_report()
+
+        self.assertEqual(sorted(results["processed_errors"]["success"]), ["err_a", "err_b"])
+        self.assertEqual(sorted(results["processed_errors"]["failure"]), ["err_c"])
+        self.assertEqual(results["preconditions_added"], ["__CPROVER_assume(p != NULL);"])
+
+
+if __name__ == "__main__":
+    unittest.main()
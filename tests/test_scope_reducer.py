@@ -180,12 +180,14 @@ class FakeReducerAgent:
             encoding="utf-8",
         )
 
-    def restore_backup(self, tag: str):
+    def restore_backup(self, tag: str, discard: bool = False):
         self.update_harness(
             Path(self.harness_dir, f"{self.harness_file_name}.{tag}.backup").read_text(
                 encoding="utf-8"
             )
         )
+        if discard:
+            self.discard_backup(tag)
 
     def discard_backup(self, tag: str):
         for file_name in [